@@ -4,13 +4,199 @@ markdownファイルから記事情報を抽出してChromaDBに登録
 """
 
 import os
-import re
 import argparse
+import mmap
+import multiprocessing
+import pickle
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, Any
+from typing import Callable, Deque, Dict, Any, Iterator, List, Optional, Set, Tuple
 from rag_system import WikipediaRAG
 from tqdm import tqdm
 
+# RE2（google-re2）があれば線形時間保証のある正規表現エンジンを使う
+try:
+    import re2 as re
+except ImportError:
+    import re
+
+
+# ChromaDBへ一度に登録する記事数
+BATCH_SIZE = 256
+
+# ChromaDBに登録する文書の最大文字数
+# （埋め込みモデルはこれより短い長さで切り詰めるため、超過分は保存容量を増やすだけ）
+MAX_DOCUMENT_CHARS = 8000
+
+# ワーカープロセスへ一度に渡すファイル数（プロセス間通信の回数を抑える）
+PARSE_CHUNKSIZE = 32
+
+# このサイズ（バイト）以上のファイルはmmapした領域から直接デコードする
+MMAP_THRESHOLD = 1024 * 1024
+
+# 先読みに使うスレッド数（並列化しない場合にファイル読み込みとパースを重ねる）
+READ_WORKERS = 8
+
+# パース結果キャッシュ（markdownファイルと同じ場所に <ファイル名>.pkl で保存）
+PARSE_CACHE_SUFFIX = '.pkl'
+
+# キャッシュする登録単位の形式（切り詰め長さなど）を変えたら上げる
+# （古いキャッシュを無効にする）
+_PARSE_CACHE_VERSION = 4
+
+# パース用の正規表現（モジュール読み込み時に一度だけコンパイル）
+# re と re2 のどちらでも同じ意味になるよう、フラグはインラインで指定し、
+# \s \d \w は使わない（RE2ではASCIIのみに一致し、re では全角文字にも一致するため）。
+# 空白は全角スペースを含む文字クラスで明示する
+_SPACE_CHARS = ' \t\n\v\f\r\u3000'
+_SPACE = '[' + _SPACE_CHARS + ']'
+_HSPACE = '[ \t\u3000]'  # 改行を含まない空白
+# セクション区切りは固定の接頭辞 "\n---" から始まるため、re はこの接頭辞の
+# リテラル検索で候補位置を探す。全見出しの位置を一度の線形走査で得られるので、
+# 複数パターン用のマッチャ（Hyperscan など）は使わない。
+_SECTION_SPLIT = re.compile(r'\n---' + _SPACE + r'*\n##' + _SPACE + '+')
+# 値が空の場合に次の行を値として取り込まないよう、コロンの後は行内の空白のみ
+_META_RE = re.compile(r'\*\*([^*]+)\*\*:' + _HSPACE + r'*([^\n]+)')
+_TITLE_RE = re.compile(r'(?m)^#' + _SPACE + r'+(.+)$')
+_DIGITS_RE = re.compile(r'[0-9]+')
+_TOKEN_RE = re.compile('[^' + _SPACE_CHARS + ']+')  # 空白までの値（言語コードなど）
+
+# セクション区切りのないファイルでメタデータを探す範囲（文字数）
+_MAX_HEADER_CHARS = 4096
+
+
+def _iter_list_items(text: str) -> Iterator[str]:
+    """箇条書き（- で始まる行）の項目を順に取り出す"""
+    for line in text.splitlines():
+        line = line.strip()
+        if line[:1] == '-':
+            yield line.strip('- ').strip()
+
+
+def _handle_summary(text: str, result: Dict[str, Any]) -> None:
+    """要約セクション"""
+    result['summary'] = text.strip()
+
+
+def _handle_categories(text: str, result: Dict[str, Any]) -> None:
+    """カテゴリセクション"""
+    result['categories'] = [
+        item.replace('Category:', '') for item in _iter_list_items(text)
+    ]
+
+
+def _handle_section_structure(text: str, result: Dict[str, Any]) -> None:
+    """セクション構造セクション"""
+    result['section_structure'] = list(_iter_list_items(text))
+
+
+def _handle_body(text: str, result: Dict[str, Any]) -> None:
+    """本文セクション"""
+    result['body'] = text.strip()
+
+
+# 見出し名 -> セクションハンドラ
+_SECTION_HANDLERS: Dict[str, Callable[[str, Dict[str, Any]], None]] = {
+    '要約': _handle_summary,
+    'カテゴリ': _handle_categories,
+    'セクション構造': _handle_section_structure,
+    '本文': _handle_body,
+}
+
+
+def _match_or_default(pattern: Any, value: str, default: str) -> str:
+    """値の先頭がパターンに一致すればその部分を、しなければデフォルト値を返す"""
+    match = pattern.match(value)
+    return match.group(0) if match else default
+
+
+def _read_markdown(file_path: str) -> str:
+    """
+    markdownファイルの内容を読み込む
+    
+    大きいファイルはmmapした領域から直接デコードし、
+    読み込み用のbytesオブジェクトへのコピーを省く。
+    """
+    with open(file_path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size >= MMAP_THRESHOLD:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                content = str(mm, 'utf-8')
+        else:
+            content = f.read().decode('utf-8')
+    
+    # テキストモードでの読み込みと同じく改行を \n にそろえる
+    if '\r' in content:
+        content = content.replace('\r\n', '\n').replace('\r', '\n')
+    return content
+
+
+def _parse_markdown(file_path: str, content: str) -> Dict[str, Any]:
+    """
+    読み込み済みのmarkdownをパース
+    
+    ファイル全体を `---` + `##` 見出しの区切りで一度だけ分割し、
+    先頭のヘッダ部からメタデータを、以降の各セクションを見出し名で
+    振り分けて抽出する。
+    
+    Args:
+        file_path: markdownファイルのパス（タイトルがない場合に使用）
+        content: ファイルの内容
+    
+    Returns:
+        記事情報の辞書
+    """
+    # ヘッダ部（タイトル・ページID・URL・言語・取得日時）は最初の区切りまで。
+    # 区切りがない（想定形式でない）ファイルは先頭だけを探す
+    header, *sections = _SECTION_SPLIT.split(content)
+    if not sections:
+        header = header[:_MAX_HEADER_CHARS]
+    
+    # **キー**: 値 形式のメタデータ（ヘッダ部および未知のセクションから収集）
+    meta: Dict[str, str] = {}
+    for match in _META_RE.finditer(header):
+        meta.setdefault(match.group(1), match.group(2).strip())
+    
+    result: Dict[str, Any] = {
+        'summary': "",
+        'categories': [],
+        'section_structure': [],
+        'body': "",
+    }
+    for section in sections:
+        heading, _, text = section.partition('\n')
+        handler = _SECTION_HANDLERS.get(heading.strip())
+        if handler is None:
+            # リンク情報などのセクション
+            for match in _META_RE.finditer(text):
+                meta.setdefault(match.group(1), match.group(2).strip())
+        else:
+            handler(text, result)
+    
+    # タイトルの抽出
+    title_match = _TITLE_RE.search(header)
+    title = title_match.group(1).strip() if title_match else os.path.basename(file_path)
+    
+    # ChromaDBに登録する文書（ヘッダ等を除いた要約＋本文）
+    # 想定形式でないファイルは内容をそのまま使う
+    document = '\n\n'.join(
+        text for text in (result['summary'], result['body']) if text
+    ) or content.strip()
+    
+    return {
+        'title': title,
+        'page_id': _match_or_default(_DIGITS_RE, meta.get('ページID', ''), ""),
+        'url': meta.get('URL', ""),
+        'language': _match_or_default(_TOKEN_RE, meta.get('言語', ''), ""),
+        'fetch_datetime': meta.get('取得日時', ""),
+        'summary': result['summary'],
+        'categories': result['categories'],
+        'section_structure': result['section_structure'],
+        'body': result['body'],
+        'link_count': _match_or_default(_DIGITS_RE, meta.get('内部リンク総数', ''), "0"),
+        'document': document
+    }
+
 
 def parse_wikipedia_markdown(file_path: str) -> Dict[str, Any]:
     """
@@ -22,111 +208,246 @@ def parse_wikipedia_markdown(file_path: str) -> Dict[str, Any]:
     Returns:
         記事情報の辞書
     """
-    with open(file_path, 'r', encoding='utf-8') as f:
-        content = f.read()
+    return _parse_markdown(file_path, _read_markdown(file_path))
+
+
+# ChromaDBへの登録単位 (ID, 文書, メタデータ)
+Record = Tuple[str, str, Dict[str, Any]]
+
+
+def _to_record(file_path: str, data: Dict[str, Any]) -> Record:
+    """
+    記事情報の辞書をChromaDBへの登録単位に変換
     
-    # タイトルの抽出
-    title_match = re.search(r'^#\s+(.+)$', content, re.MULTILINE)
-    title = title_match.group(1).strip() if title_match else os.path.basename(file_path)
+    登録に使う項目だけにすることで、ワーカープロセスから返すデータを小さくする。
+    要約・文書の切り詰めやカテゴリの結合もここで一度だけ行い、
+    キャッシュにはこの結果を保存する（登録ループでは何も加工しない）。
+    ファイルの場所はデータの移動で変わるため、メタデータの 'source' は含めず
+    _complete_record で付け加える。
+    """
+    if data['page_id']:
+        doc_id = f"wiki_{data['page_id']}"
+    else:
+        doc_id = f"wiki_{os.path.splitext(os.path.basename(file_path))[0]}"
+    
+    metadata = {
+        'title': data['title'],
+        'page_id': data['page_id'],
+        'url': data['url'],
+        'language': data['language'],
+        'fetch_datetime': data['fetch_datetime'],
+        'summary': data['summary'][:500],  # 500文字に制限
+        'categories': ','.join(data['categories'][:10]),  # 上位10件
+        'link_count': data['link_count']
+    }
+    return doc_id, data['document'][:MAX_DOCUMENT_CHARS], metadata
+
+
+def _load_parse_cache(file_path: str) -> Optional[Record]:
+    """
+    パース結果キャッシュを読み込む
+    
+    キャッシュが元ファイル以降に作られ、形式のバージョンが一致する場合のみ返す。
+    読めない・形式が違うキャッシュはキャッシュなしとして扱う（パース後に上書きされる）。
+    """
+    cache_path = file_path + PARSE_CACHE_SUFFIX
+    try:
+        if os.path.getmtime(cache_path) < os.path.getmtime(file_path):
+            return None
+        with open(cache_path, 'rb') as f:
+            cached = pickle.load(f)
+    except Exception:
+        return None
+    if not (isinstance(cached, tuple) and len(cached) == 2):
+        return None
+    version, record = cached
+    return record if version == _PARSE_CACHE_VERSION else None
+
+
+def _save_parse_cache(file_path: str, record: Record) -> None:
+    """パース結果キャッシュを保存（書き込めない場合は何もしない）"""
+    try:
+        with open(file_path + PARSE_CACHE_SUFFIX, 'wb') as f:
+            pickle.dump((_PARSE_CACHE_VERSION, record), f, protocol=pickle.HIGHEST_PROTOCOL)
+    except OSError:
+        pass
+
+
+def _read_markdown_or_cache(
+    file_path: str,
+    use_cache: bool
+) -> Tuple[Optional[Record], Optional[str]]:
+    """
+    有効なキャッシュがあれば (登録単位, None) を、
+    なければ (None, ファイルの内容) を返す
+    """
+    if use_cache:
+        record = _load_parse_cache(file_path)
+        if record is not None:
+            return record, None
+    return None, _read_markdown(file_path)
+
+
+def _complete_record(
+    file_path: str,
+    record: Optional[Record],
+    content: Optional[str],
+    use_cache: bool
+) -> Tuple[Optional[Record], Optional[str]]:
+    """
+    _read_markdown_or_cache の結果から登録単位を仕上げる
+    
+    キャッシュがなければパースして登録単位に変換し、必要ならキャッシュに保存する。
+    読み込み元のパスはキャッシュに含めず、ここで現在のパスを設定する。
+    
+    Returns:
+        (登録単位, エラーメッセージ) のタプル
+    """
+    try:
+        if record is None:
+            record = _to_record(file_path, _parse_markdown(file_path, content))
+            if use_cache:
+                _save_parse_cache(file_path, record)
+        record[2]['source'] = file_path
+        return record, None
+    except Exception as e:
+        return None, str(e)
+
+
+def _parse_file(
+    file_path: str,
+    use_cache: bool = False
+) -> Tuple[Optional[Record], Optional[str]]:
+    """
+    ワーカープロセス用のパース処理
     
-    # ページIDの抽出
-    page_id_match = re.search(r'\*\*ページID\*\*:\s*(\d+)', content)
-    page_id = page_id_match.group(1) if page_id_match else ""
+    例外をプロセス間で受け渡さず、1ファイルの失敗で全体が止まらないように
+    エラーメッセージとして返す。
     
-    # URLの抽出
-    url_match = re.search(r'\*\*URL\*\*:\s*(.+)$', content, re.MULTILINE)
-    url = url_match.group(1).strip() if url_match else ""
+    Args:
+        file_path: markdownファイルのパス
+        use_cache: Trueの場合、パース結果キャッシュを読み書きする
     
-    # 言語の抽出
-    lang_match = re.search(r'\*\*言語\*\*:\s*(\w+)', content)
-    language = lang_match.group(1) if lang_match else ""
+    Returns:
+        (登録単位, エラーメッセージ) のタプル
+    """
+    try:
+        record, content = _read_markdown_or_cache(file_path, use_cache)
+    except Exception as e:
+        return None, str(e)
+    return _complete_record(file_path, record, content, use_cache)
+
+
+def _parse_files(
+    file_paths: List[str],
+    use_cache: bool = False
+) -> List[Tuple[Optional[Record], Optional[str]]]:
+    """ワーカープロセス用: 複数ファイルをまとめてパース（プロセス間通信の回数を抑える）"""
+    return [_parse_file(file_path, use_cache) for file_path in file_paths]
+
+
+def _parse_in_pool(
+    executor: ProcessPoolExecutor,
+    file_paths: List[str],
+    use_cache: bool,
+    max_pending: int
+) -> Iterator[Tuple[Optional[Record], Optional[str]]]:
+    """
+    ワーカープロセスでパースし、結果をファイル順に返す
     
-    # 取得日時の抽出
-    datetime_match = re.search(r'\*\*取得日時\*\*:\s*(.+)$', content, re.MULTILINE)
-    fetch_datetime = datetime_match.group(1).strip() if datetime_match else ""
+    PARSE_CHUNKSIZE 件ずつ投入し、未回収のチャンクは max_pending 個までに抑える。
+    ChromaDBへの登録が遅れても、パース済みの結果がメインプロセスに溜まり続けない。
     
-    # 要約の抽出（---で区切られたセクションから）
-    summary_match = re.search(
-        r'---\s*##\s+要約\s*\n\s*(.+?)\s*---',
-        content,
-        re.DOTALL
-    )
-    summary = summary_match.group(1).strip() if summary_match else ""
-    
-    # カテゴリの抽出
-    categories = []
-    category_match = re.search(
-        r'---\s*##\s+カテゴリ\s*\n(.+?)\s*---',
-        content,
-        re.DOTALL
-    )
-    if category_match:
-        category_text = category_match.group(1)
-        categories = [
-            line.strip('- ').strip().replace('Category:', '')
-            for line in category_text.split('\n')
-            if line.strip().startswith('-')
-        ]
-    
-    # セクション構造の抽出
-    section_structure = []
-    section_match = re.search(
-        r'---\s*##\s+セクション構造\s*\n(.+?)\s*---',
-        content,
-        re.DOTALL
-    )
-    if section_match:
-        section_text = section_match.group(1)
-        for line in section_text.split('\n'):
-            if line.strip().startswith('-'):
-                section_structure.append(line.strip('- ').strip())
-    
-    # 本文の抽出
-    body_match = re.search(
-        r'---\s*##\s+本文\s*\n(.+?)(?:\n---\n|\Z)',
-        content,
-        re.DOTALL
+    Returns:
+        (登録単位, エラーメッセージ) のタプルを _parse_file と同じ形で返す
+    """
+    chunks = (
+        file_paths[i:i + PARSE_CHUNKSIZE]
+        for i in range(0, len(file_paths), PARSE_CHUNKSIZE)
     )
-    body = body_match.group(1).strip() if body_match else ""
+    pending: Deque[Future] = deque()
     
-    # リンク情報の抽出（オプショナル）
-    link_count_match = re.search(r'\*\*内部リンク総数\*\*:\s*(\d+)', content)
-    link_count = link_count_match.group(1) if link_count_match else "0"
+    def submit_next() -> None:
+        chunk = next(chunks, None)
+        if chunk is not None:
+            pending.append(executor.submit(_parse_files, chunk, use_cache))
     
-    return {
-        'title': title,
-        'page_id': page_id,
-        'url': url,
-        'language': language,
-        'fetch_datetime': fetch_datetime,
-        'summary': summary,
-        'categories': categories,
-        'section_structure': section_structure,
-        'body': body,
-        'link_count': link_count,
-        'full_content': content
-    }
+    for _ in range(max_pending):
+        submit_next()
+    
+    while pending:
+        future = pending.popleft()
+        submit_next()
+        yield from future.result()
+
+
+def _parse_prefetched(
+    file_paths: List[str],
+    use_cache: bool = False,
+    max_workers: int = READ_WORKERS
+) -> Iterator[Tuple[Optional[Record], Optional[str]]]:
+    """
+    スレッドでファイルを先読みしながら順にパース
+    
+    パース中に後続ファイルの読み込みを進めてI/O待ちを隠す。
+    先読みは max_workers * 2 件までに抑え、全ファイルを一度にメモリに載せない。
+    
+    Returns:
+        (登録単位, エラーメッセージ) のタプルを _parse_file と同じ形で返す
+    """
+    remaining = iter(file_paths)
+    pending: Deque[Tuple[str, Future]] = deque()
+    
+    with ThreadPoolExecutor(max_workers=max_workers) as reader:
+        def submit_next() -> None:
+            file_path = next(remaining, None)
+            if file_path is not None:
+                pending.append((
+                    file_path,
+                    reader.submit(_read_markdown_or_cache, file_path, use_cache)
+                ))
+        
+        for _ in range(max_workers * 2):
+            submit_next()
+        
+        while pending:
+            file_path, future = pending.popleft()
+            submit_next()
+            try:
+                record, content = future.result()
+            except Exception as e:
+                yield None, str(e)
+                continue
+            yield _complete_record(file_path, record, content, use_cache)
 
 
-def load_wikipedia_data(data_dir: str, reset: bool = False) -> None:
+def load_wikipedia_data(
+    data_dir: str,
+    reset: bool = False,
+    batch_size: int = BATCH_SIZE,
+    workers: Optional[int] = None,
+    use_cache: bool = False
+) -> None:
     """
     Wikipediaデータの読み込みと登録
     
     Args:
         data_dir: Wikipediaのmarkdownファイルが格納されているディレクトリ
         reset: Trueの場合、既存データをリセット
+        batch_size: ChromaDBへ一度に登録する記事数
+        workers: パースに使うプロセス数（None の場合はCPUコア数、1 の場合は並列化しない）
+        use_cache: Trueの場合、パース結果を <ファイル名>.pkl にキャッシュし、
+            次回以降は更新されていないファイルのパースを省略する
     """
-    rag = WikipediaRAG()
-    
-    # リセット確認
+    # リセット確認（埋め込みモデル変更後でも開けるよう、コレクションを開く前に行う）
+    reset_confirmed = False
     if reset:
         confirm = input("既存のデータをリセットしますか？ (y/N): ")
-        if confirm.lower() == 'y':
-            rag.client.delete_collection("wikipedia_articles")
-            rag.collection = rag.client.get_or_create_collection(
-                name="wikipedia_articles"
-            )
-            print("データをリセットしました。")
+        reset_confirmed = confirm.lower() == 'y'
+    
+    rag = WikipediaRAG(reset_collection=reset_confirmed)
+    if reset_confirmed:
+        print("データをリセットしました。")
     
     # データディレクトリの存在確認
     data_path = Path(data_dir)
@@ -147,34 +468,98 @@ def load_wikipedia_data(data_dir: str, reset: bool = False) -> None:
     success_count = 0
     error_count = 0
     
-    for file_path in tqdm(md_files, desc="データ読み込み中"):
+    # 登録待ちのバッチ
+    documents: List[str] = []
+    metadatas: List[Dict[str, Any]] = []
+    ids: List[str] = []
+    # 今回の実行で登録したIDの重複検出用
+    # （同じバッチ内の重複は add() 全体を失敗させ、別バッチの重複は黙って無視されるため、
+    # バッチサイズに関係なく同じようにエラーとして扱う）
+    seen_ids: Set[str] = set()
+    
+    def flush() -> None:
+        """溜まったバッチをChromaDBに一括登録"""
+        nonlocal documents, metadatas, ids, success_count, error_count
+        if not ids:
+            return
         try:
-            # パース
-            data = parse_wikipedia_markdown(str(file_path))
-            
-            # ChromaDBに登録
-            doc_id = f"wiki_{data['page_id']}" if data['page_id'] else f"wiki_{file_path.stem}"
-            
             rag.collection.add(
-                documents=[data['full_content']],
-                metadatas=[{
-                    'title': data['title'],
-                    'page_id': data['page_id'],
-                    'url': data['url'],
-                    'language': data['language'],
-                    'fetch_datetime': data['fetch_datetime'],
-                    'summary': data['summary'][:500],  # 500文字に制限
-                    'categories': ','.join(data['categories'][:10]),  # 上位10件
-                    'link_count': data['link_count'],
-                    'source': str(file_path)
-                }],
-                ids=[doc_id]
+                documents=documents,
+                metadatas=metadatas,
+                ids=ids
             )
-            success_count += 1
-            
+            success_count += len(ids)
         except Exception as e:
-            error_count += 1
-            print(f"\nエラー ({file_path.name}): {e}")
+            # 問題のある記事だけをエラーにするため、1件ずつ登録し直す
+            print(f"\nエラー (バッチ登録 {len(ids)}件): {e} - 1件ずつ登録し直します")
+            for doc_id, document, metadata in zip(ids, documents, metadatas):
+                try:
+                    rag.collection.add(
+                        documents=[document],
+                        metadatas=[metadata],
+                        ids=[doc_id]
+                    )
+                    success_count += 1
+                except Exception as e:
+                    error_count += 1
+                    print(f"\nエラー ({os.path.basename(metadata['source'])}): {e}")
+        documents, metadatas, ids = [], [], []
+    
+    # パースはワーカープロセスで並列に行い、ChromaDBへの登録はメインプロセスで順に行う
+    # （並列化しない場合はスレッドでの先読みで読み込みとパースを重ねる）
+    workers = workers or os.cpu_count() or 1
+    file_paths = [str(file_path) for file_path in md_files]
+    # ChromaDBクライアントがスレッドを起動済みのため、fork ではなく spawn でワーカーを作る
+    # （スレッドのあるプロセスを fork するとデッドロックの恐れがある）
+    executor = ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn")
+    ) if workers > 1 else None
+    try:
+        if executor is not None:
+            parsed = _parse_in_pool(
+                executor,
+                file_paths,
+                use_cache,
+                max_pending=workers * 2
+            )
+        else:
+            parsed = _parse_prefetched(file_paths, use_cache)
+        
+        for file_path, (record, error) in tqdm(
+            zip(md_files, parsed),
+            total=len(md_files),
+            desc="データ読み込み中",
+            # 表示の更新は全体で200回程度・1秒に1回までに抑える
+            mininterval=1.0,
+            miniters=max(1, len(md_files) // 200),
+            smoothing=0.05
+        ):
+            if error is not None:
+                error_count += 1
+                print(f"\nエラー ({file_path.name}): {error}")
+                continue
+            
+            # 列ごとのバッファに追加
+            doc_id, document, metadata = record
+            if doc_id in seen_ids:
+                error_count += 1
+                print(f"\nエラー ({file_path.name}): ID '{doc_id}' が他の記事と重複しています")
+                continue
+            seen_ids.add(doc_id)
+            ids.append(doc_id)
+            documents.append(document)
+            metadatas.append(metadata)
+            
+            # バッチサイズに達したらChromaDBに登録
+            if len(ids) >= batch_size:
+                flush()
+        
+        # 残りのバッチを登録
+        flush()
+    finally:
+        if executor is not None:
+            executor.shutdown()
     
     # 統計情報の表示
     stats = rag.get_collection_stats()
@@ -199,6 +584,23 @@ def main():
         action='store_true',
         help='既存のデータをリセットしてから読み込む'
     )
+    parser.add_argument(
+        '--batch-size',
+        type=int,
+        default=BATCH_SIZE,
+        help=f'ChromaDBへ一度に登録する記事数 (デフォルト: {BATCH_SIZE})'
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=None,
+        help='パースに使うプロセス数 (デフォルト: CPUコア数)'
+    )
+    parser.add_argument(
+        '--cache',
+        action='store_true',
+        help='パース結果を <ファイル名>.pkl にキャッシュし、再実行時は更新されていないファイルのパースを省略する'
+    )
     
     args = parser.parse_args()
     
@@ -206,7 +608,13 @@ def main():
     print(f"データディレクトリ: {args.data_dir}\n")
     
     # データの読み込み
-    load_wikipedia_data(args.data_dir, args.reset)
+    load_wikipedia_data(
+        args.data_dir,
+        args.reset,
+        batch_size=args.batch_size,
+        workers=args.workers,
+        use_cache=args.cache
+    )
 
 
 if __name__ == "__main__":
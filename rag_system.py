@@ -4,20 +4,26 @@ ChromaDBとGemini APIを使用した一般的な情報検索・質問応答シ
 """
 
 import os
-from typing import List, Dict, Any, Optional
-import chromadb
-from chromadb.config import Settings
-import google.generativeai as genai
+import sys
+import copy
+import json
+from collections import OrderedDict
+from typing import List, Dict, Any, Optional, Tuple
 from dotenv import load_dotenv
 
 
+# 検索結果キャッシュに保持するクエリ数
+SEARCH_CACHE_SIZE = 256
+
+
 class WikipediaRAG:
     """Wikipedia情報を活用したRAGシステム"""
     
     def __init__(
         self,
         chroma_db_path: str = "./chroma_db",
-        collection_name: str = "wikipedia_articles"
+        collection_name: str = "wikipedia_articles",
+        reset_collection: bool = False
     ):
         """
         RAGシステムの初期化
@@ -25,7 +31,14 @@ class WikipediaRAG:
         Args:
             chroma_db_path: ChromaDBの永続化パス
             collection_name: コレクション名
+            reset_collection: Trueの場合、既存のコレクションを開かずに削除して作り直す
+                （埋め込みモデルを変更した場合など）
         """
+        # 重いライブラリは使うときに読み込む（import するだけのモジュールを軽くする）
+        import chromadb
+        from chromadb.config import Settings
+        import google.generativeai as genai
+        
         # 環境変数の読み込み
         load_dotenv()
         
@@ -50,19 +63,74 @@ class WikipediaRAG:
             )
         )
         
+        # 検索結果キャッシュ（同じクエリの埋め込み計算・ベクトル検索を省略）
+        # インスタンスが生きている間は保持されるため、別プロセスで追加登録した
+        # データを検索結果に反映するにはプロセスを再起動する
+        self._search_cache: "OrderedDict[Tuple[Any, ...], List[Dict[str, Any]]]" = OrderedDict()
+        
+        # 埋め込みモデルの設定（未指定の場合はChromaDBのデフォルト）
+        self.embedding_function = self._create_embedding_function()
+        collection_kwargs = {}
+        if self.embedding_function is not None:
+            collection_kwargs["embedding_function"] = self.embedding_function
+        
+        # リセット指定時は既存のコレクションを削除
+        exists = self._collection_exists(collection_name)
+        if reset_collection and exists:
+            self.chroma_client.delete_collection(collection_name)
+            exists = False
+        
         # コレクションの取得または作成
-        try:
-            self.collection = self.chroma_client.get_collection(
-                name=collection_name
-            )
+        if exists:
+            try:
+                self.collection = self.chroma_client.get_collection(
+                    name=collection_name,
+                    **collection_kwargs
+                )
+            except Exception as e:
+                # 作成時と異なる埋め込みモデルを指定した場合など
+                raise ValueError(
+                    f"コレクション '{collection_name}' を開けませんでした: {e}\n"
+                    "埋め込みモデル（EMBEDDING_MODEL）を変更した場合は、"
+                    "python data_loader.py --reset でデータを登録し直してください"
+                ) from e
             print(f"既存のコレクション '{collection_name}' を読み込みました")
-        except:
+        else:
             self.collection = self.chroma_client.create_collection(
                 name=collection_name,
-                metadata={"description": "Wikipedia記事情報コレクション"}
+                metadata={"description": "Wikipedia記事情報コレクション"},
+                **collection_kwargs
             )
             print(f"新しいコレクション '{collection_name}' を作成しました")
     
+    def _collection_exists(self, collection_name: str) -> bool:
+        """コレクションが存在するか確認（名前のみ・Collectionを返す両方のバージョンに対応）"""
+        return any(
+            getattr(collection, "name", collection) == collection_name
+            for collection in self.chroma_client.list_collections()
+        )
+    
+    def _create_embedding_function(self):
+        """
+        環境変数で指定された埋め込みモデルを作成
+        
+        EMBEDDING_MODEL にsentence-transformersのモデル名を指定すると、
+        登録・検索の両方でそのモデルを使う（EMBEDDING_DEVICE=cuda でGPUを使用）。
+        未指定の場合はNoneを返し、ChromaDBのデフォルトの埋め込みを使う。
+        """
+        model_name = os.getenv("EMBEDDING_MODEL")
+        if not model_name:
+            return None
+        
+        from chromadb.utils import embedding_functions
+        
+        device = os.getenv("EMBEDDING_DEVICE", "cpu")
+        print(f"埋め込みモデル: {model_name} ({device})")
+        return embedding_functions.SentenceTransformerEmbeddingFunction(
+            model_name=model_name,
+            device=device
+        )
+    
     def search_similar_content(
         self,
         query: str,
@@ -79,22 +147,67 @@ class WikipediaRAG:
         
         Returns:
             検索結果のリスト
+        
+        Note:
+            結果はインスタンスごとにキャッシュされ、同じプロセス内では
+            後から登録されたデータは反映されない
+        """
+        # 同じ条件の検索結果があれば再利用（コレクションが差し替えられたら別キー）
+        cache_key = (
+            str(self.collection.id),
+            query,
+            n_results,
+            json.dumps(where, sort_keys=True, ensure_ascii=False) if where else None
+        )
+        cached = self._search_cache.get(cache_key)
+        if cached is not None:
+            self._search_cache.move_to_end(cache_key)
+            return copy.deepcopy(cached)
+        
+        results = self.search_similar_batch([query], n_results, where)[0]
+        
+        self._search_cache[cache_key] = results
+        if len(self._search_cache) > SEARCH_CACHE_SIZE:
+            self._search_cache.popitem(last=False)
+        # 呼び出し側が結果を変更してもキャッシュに影響しないようコピーを返す
+        return copy.deepcopy(results)
+    
+    def search_similar_batch(
+        self,
+        queries: List[str],
+        n_results: int = 3,
+        where: Optional[Dict[str, Any]] = None
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        複数のクエリで類似記事をまとめて検索（1回の問い合わせで処理）
+        
+        Args:
+            queries: 検索クエリのリスト
+            n_results: クエリごとに取得する結果数
+            where: メタデータフィルタ
+        
+        Returns:
+            クエリごとの検索結果のリスト
         """
         results = self.collection.query(
-            query_texts=[query],
+            query_texts=queries,
             n_results=n_results,
             where=where
         )
         
-        # 結果を整形
+        # 結果をクエリごとに整形
+        distances = results.get('distances')
         formatted_results = []
-        for i in range(len(results['ids'][0])):
-            formatted_results.append({
-                'id': results['ids'][0][i],
-                'document': results['documents'][0][i],
-                'metadata': results['metadatas'][0][i],
-                'distance': results['distances'][0][i] if 'distances' in results else None
-            })
+        for q in range(len(queries)):
+            query_results = []
+            for i in range(len(results['ids'][q])):
+                query_results.append({
+                    'id': results['ids'][q][i],
+                    'document': results['documents'][q][i],
+                    'metadata': results['metadatas'][q][i],
+                    'distance': distances[q][i] if distances else None
+                })
+            formatted_results.append(query_results)
         
         return formatted_results
     
@@ -102,7 +215,8 @@ class WikipediaRAG:
         self,
         query: str,
         n_results: int = 3,
-        temperature: float = 0.7
+        temperature: float = 0.7,
+        stream: bool = False
     ) -> str:
         """
         RAGを使用して質問に回答
@@ -111,6 +225,8 @@ class WikipediaRAG:
             query: 質問内容
             n_results: 参考にする記事数
             temperature: 生成の創造性（0.0-1.0）
+            stream: Trueの場合、生成された回答を届いた順に標準出力へ表示する
+                （エラー等のメッセージも表示するため、呼び出し側での表示は不要）
         
         Returns:
             生成された回答
@@ -125,6 +241,8 @@ class WikipediaRAG:
         prompt = self._build_prompt(query, context)
         
         # Gemini APIで生成
+        import google.generativeai as genai
+        
         generation_config = genai.types.GenerationConfig(
             temperature=temperature,
             max_output_tokens=8000,
@@ -138,16 +256,37 @@ class WikipediaRAG:
             {"category": "HARM_CATEGORY_DANGEROUS_CONTENT", "threshold": "BLOCK_NONE"},
         ]
         
+        def message(text: str) -> str:
+            # ストリーミング時は回答以外のメッセージもここで表示する
+            if stream:
+                print(text)
+            return text
+        
         try:
             response = self.model.generate_content(
                 prompt,
                 generation_config=generation_config,
-                safety_settings=safety_settings
+                safety_settings=safety_settings,
+                stream=stream
             )
             
+            if stream:
+                # 届いたチャンクから順に表示（レスポンスには全文が蓄積される）
+                for chunk in response:
+                    if not chunk.candidates:
+                        continue
+                    text = ''.join(
+                        getattr(part, 'text', '') or ''
+                        for part in chunk.candidates[0].content.parts
+                    )
+                    if text:
+                        sys.stdout.write(text)
+                        sys.stdout.flush()
+                print()
+            
             # レスポンスの詳細確認
             if not response.candidates:
-                return "⚠️ レスポンスが生成されませんでした（候補が空）"
+                return message("⚠️ レスポンスが生成されませんでした（候補が空）")
             
             candidate = response.candidates[0]
             
@@ -165,16 +304,15 @@ class WikipediaRAG:
             
             # テキストを取得
             parts = candidate.content.parts
-            text_parts = [part.text for part in parts if hasattr(part, 'text')]
-            result = ''.join(text_parts)
+            result = ''.join(getattr(part, 'text', '') or '' for part in parts)
             
             if not result.strip():
-                return "⚠️ 空のレスポンスが返されました"
+                return message("⚠️ 空のレスポンスが返されました")
             
             return result
                 
         except Exception as e:
-            return f"❌ エラーが発生しました: {str(e)}"
+            return message(f"❌ エラーが発生しました: {str(e)}")
     
     def _build_context(self, similar_articles: List[Dict[str, Any]]) -> str:
         """類似記事からコンテキストを構築"""
@@ -5,9 +5,21 @@ RAGシステムのインタラクティブテスト
 from rag_system import WikipediaRAG
 
 
+# メニュー間で共有するRAGシステム（初回利用時に作成）
+_rag = None
+
+
+def _get_rag() -> WikipediaRAG:
+    """RAGシステムを取得（ChromaDBクライアントの再作成を避けるため使い回す）"""
+    global _rag
+    if _rag is None:
+        _rag = WikipediaRAG()
+    return _rag
+
+
 def test_search():
     """類似情報検索のテスト"""
-    rag = WikipediaRAG()
+    rag = _get_rag()
     
     query = input("\n検索キーワードを入力: ")
     n_results = int(input("取得件数 (デフォルト: 3): ") or "3")
@@ -46,23 +58,22 @@ def test_search():
 
 def test_qa():
     """質問応答のテスト"""
-    rag = WikipediaRAG()
+    rag = _get_rag()
     
     query = input("\n質問を入力: ")
     
     print(f"\n回答を生成中...\n")
-    answer = rag.generate_answer(query)
     
     print("=" * 60)
     print("【回答】")
     print("=" * 60)
-    print(answer)
+    rag.generate_answer(query, stream=True)
     print("=" * 60)
 
 
 def interactive_mode():
     """インタラクティブモード"""
-    rag = WikipediaRAG()
+    rag = _get_rag()
     
     print("\nインタラクティブモードを開始します")
     print("終了するには 'quit' または 'exit' と入力してください\n")
@@ -78,16 +89,15 @@ def interactive_mode():
             continue
         
         print("\n回答を生成中...\n")
-        answer = rag.generate_answer(query)
         
         print("-" * 60)
-        print(answer)
+        rag.generate_answer(query, stream=True)
         print("-" * 60)
 
 
 def show_statistics():
     """統計情報の表示"""
-    rag = WikipediaRAG()
+    rag = _get_rag()
     stats = rag.get_collection_stats()
     
     print(f"\n統計情報:")